@@ -1,11 +1,40 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import os
+import csv
 import datetime
-from io import BytesIO
+import hashlib
+import threading
+from functools import lru_cache, partial
+from io import BytesIO, StringIO
+from pandas.api.types import union_categoricals
+
+try:
+    import pyarrow
+    import pyarrow.csv as pa_csv  # Multithreaded CSV reader, see _read_csv
+    import pyarrow.parquet as pq  # Typed snapshot of the parsed log, see _read_journal
+except ImportError:
+    pyarrow = None
+
+try:
+    import polars as pl  # Optional faster engine for the View Progress aggregations
+except ImportError:
+    pl = None
+
+try:
+    import xlsxwriter  # Faster than openpyxl for the plain, unstyled exports below
+except ImportError:
+    xlsxwriter = None
 
 # --- Configuration ---
 DATA_FILENAME = "predefined_workouts_with_data.csv"
+DATA_COLUMNS = ["date", "category", "exercise", "weight", "reps"]
+SNAPSHOT_FILENAME = "predefined_workouts_with_data.parquet"
+# Rewrite the Parquet snapshot once this many rows were appended to the CSV since the last one
+SNAPSHOT_INTERVAL_ROWS = 1000
+# The data caches are keyed on the file version; only the most recent few are worth keeping
+CACHE_MAX_ENTRIES = 16
 
 DEFAULT_CATEGORIES = {
     "Chest": ["Barbell Bench Press", "Dumbbell Fly"],
@@ -15,88 +44,429 @@ DEFAULT_CATEGORIES = {
     "Shoulders": ["Shoulder Press", "Lateral Raise"]
 }
 
+# Metric choices in the View Progress radios and the summary column each one reads
+METRIC_COLUMNS = {"Number of Sets": "Count", "Total Volume": "Total Volume"}
+
 
 # --- Helper Functions ---
 
+@lru_cache(maxsize=1)
 def get_data_file_path():
-    """Calculates the absolute path to the data CSV file."""
+    """
+    Calculates the absolute path to the data CSV file.
+    Memoized: it never changes, and the loaders and writers ask for it many times per run.
+    """
     script_dir = os.path.dirname(os.path.abspath(__file__))
     parent_dir = os.path.dirname(script_dir)
     return os.path.join(parent_dir, DATA_FILENAME)
 
 
-@st.cache_data(ttl=1)  # Cache for 1 second to ensure frequent re-reads
-def load_data():
+@lru_cache(maxsize=1)
+def get_snapshot_file_path():
+    """Calculates the absolute path to the Parquet snapshot kept next to the data CSV file."""
+    return os.path.join(os.path.dirname(get_data_file_path()), SNAPSHOT_FILENAME)
+
+
+def _empty_data():
+    """Returns an empty workout DataFrame with the same column types load_data produces."""
+    df = pd.DataFrame(columns=DATA_COLUMNS + ["volume"])
+    return df.astype({"date": "datetime64[ns]", "category": "category", "exercise": "category",
+                      "weight": float, "reps": int, "volume": float})
+
+
+def _read_csv(source, has_header, typed):
     """
-    Loads workout data from the CSV file.
-    Ensures column types are correct and handles missing file errors.
+    Reads the raw workout columns. category/exercise are taken as the literal strings in the file,
+    never inferred as numbers (a custom exercise "007" stays "007"), and stored as categoricals.
+    With typed, weight/reps are parsed as float64/int64 up front and text in them raises ValueError.
     """
-    data_file_abs_path = get_data_file_path()
+    if pyarrow is not None:
+        # pandas' pyarrow engine infers every column's type before applying a dtype, so the Arrow
+        # reader is used directly to pin the types instead
+        names = pyarrow.dictionary(pyarrow.int32(), pyarrow.string())
+        column_types = {"date": pyarrow.string(), "category": names, "exercise": names}
+        if typed:
+            column_types.update(weight=pyarrow.float64(), reps=pyarrow.int64())
+        read_options = pa_csv.ReadOptions(column_names=None if has_header else DATA_COLUMNS)
+        convert_options = pa_csv.ConvertOptions(column_types=column_types, strings_can_be_null=True)
+        return pa_csv.read_csv(source, read_options=read_options, convert_options=convert_options).to_pandas()
+    # The C engine always parses categorical categories as strings
+    dtype = {"category": "category", "exercise": "category"}
+    if typed:
+        dtype.update(weight="float64", reps="int64")
+    return pd.read_csv(source, dtype=dtype, header=0 if has_header else None,
+                       names=None if has_header else DATA_COLUMNS)
+
+
+def _parse_workouts(source, has_header=True):
+    """Parses workout rows from a CSV path or buffer and coerces the column types."""
     try:
-        df = pd.read_csv(data_file_abs_path)
-        # Ensure 'date' column is consistently a string for comparison
-        df['date'] = df['date'].astype(str)
-        # Ensure 'weight' and 'reps' are numeric, handling potential errors and filling NaNs
+        # Well-formed files get their types at parse time. Low-cardinality names are read as
+        # categoricals: equality masks and groupbys then work on integer codes, not strings
+        df = _read_csv(source, has_header, typed=True)
+    except ValueError:
+        # Non-numeric weight/reps somewhere: read them untyped and coerce below instead
+        if hasattr(source, "seek"):
+            source.seek(0)
+        df = _read_csv(source, has_header, typed=False)
+    # Ensure 'weight' and 'reps' are numeric, handling potential errors and filling NaNs
+    # (blank cells come through the typed read as NaN)
+    if df['weight'].dtype != 'float64' or df['weight'].hasnans:
         df['weight'] = pd.to_numeric(df['weight'], errors='coerce').fillna(0.0)
+    if df['reps'].dtype != 'int64':
         df['reps'] = pd.to_numeric(df['reps'], errors='coerce').fillna(0).astype(int)
+    for col in ("category", "exercise"):
+        if df[col].cat.categories.empty:  # All blank: give the empty categories the str type the rest have
+            df[col] = df[col].cat.set_categories(pd.Index([], dtype="str"))
+    # Parse dates once here so the views and charts can use the datetime column directly.
+    # log_set and the init block always write ISO dates, so the explicit format skips inference
+    df['date'] = pd.to_datetime(df['date'], format='%Y-%m-%d', errors='coerce', cache=True)
+    # Derived once at load so the visualizations don't each recompute it
+    df['volume'] = df['weight'].to_numpy() * df['reps'].to_numpy()
+    return df
+
+
+@st.cache_resource(show_spinner=False)
+def _journal_state():
+    """
+    Process-wide record of the last parse of the CSV: the typed rows, the byte offset they
+    cover, a running digest of those bytes to tell whether the file was rewritten since, the
+    file version they are known to match, and how many of the rows the on-disk Parquet
+    snapshot already holds.
+    """
+    return {"lock": threading.Lock(), "path": None, "df": None, "offset": 0, "digest": None,
+            "hasher": None, "version": None, "snapshot_rows": 0}
+
+
+def _read_journal(data_file_abs_path, version):
+    """
+    Returns the typed workout rows, parsing only the rows appended since the previous read.
+    log_set only ever appends to the CSV, so it is treated like a write-ahead log: the rows
+    parsed last time are the compacted base and only the new tail is parsed and merged in.
+    On a cold start the base comes from the Parquet snapshot when there is one. If the
+    already-parsed bytes changed (the file was edited or rewritten), everything is parsed again.
+    If the file is still at the version the rows were last synced with (e.g. log_set just
+    merged its own row in), the rows are returned without touching the file at all.
+    """
+    state = _journal_state()
+    with state["lock"]:
+        if (version is not None and state["version"] == version and state["path"] == data_file_abs_path
+                and state["df"] is not None):
+            return state["df"]
+        with open(data_file_abs_path, "rb") as f:
+            content = f.read()
+        if state["path"] != data_file_abs_path or state["df"] is None:
+            snapshot = _load_snapshot()
+            if snapshot is not None:
+                snapshot_df, snapshot_offset, snapshot_digest = snapshot
+                state.update(path=data_file_abs_path, df=snapshot_df, offset=snapshot_offset,
+                             digest=snapshot_digest, snapshot_rows=len(snapshot_df))
+        offset = state["offset"]
+        hasher = hashlib.blake2b(content[:offset])
+        if (state["path"] == data_file_abs_path and state["df"] is not None and offset > 0
+                and hasher.digest() == state["digest"]):
+            new_bytes = content[offset:]
+            if version is None or version[1] != len(content):
+                # The file changed after the stat, so another writer may be mid-row: leave an
+                # unterminated last row for the next read. Otherwise (e.g. a hand-edited file
+                # without a final newline) the last row is complete and is parsed now
+                new_bytes = new_bytes[:new_bytes.rfind(b"\n") + 1]
+            df = state["df"]
+            if new_bytes and content[offset - 1:offset] != b"\n" and not new_bytes.startswith(b"\n"):
+                df = None  # The unterminated row parsed last time has since grown; parse everything again
+            elif new_bytes:
+                try:
+                    tail = _parse_workouts(BytesIO(new_bytes), has_header=False)
+                    df = _append_workouts(df, tail)
+                except Exception:
+                    df = None  # The tail doesn't merge cleanly; parse the whole file below instead
+            offset += len(new_bytes)
+            hasher.update(new_bytes)
+        else:
+            df = None
+        if df is None:
+            df = _parse_workouts(BytesIO(content))
+            offset = len(content)
+            hasher = hashlib.blake2b(content)
+            state["snapshot_rows"] = None  # Whatever snapshot exists describes other contents
+        # The stat behind version was taken before the read; only trust it if the sizes agree and
+        # the rows cover every byte
+        synced = version if version is not None and version[1] == len(content) == offset else None
+        _commit_journal(state, data_file_abs_path, df, offset, hasher, synced,
+                        ends_with_newline=content[offset - 1:offset] == b"\n")
         return df
+
+
+def _commit_journal(state, data_file_abs_path, df, offset, hasher, version, ends_with_newline=True):
+    """
+    Records df as the rows covering the first offset bytes, refreshing the snapshot when due.
+    Snapshots are only taken at a row boundary, so the tail a cold start parses on top of one
+    always begins with a fresh row rather than the rest of an unterminated one.
+    """
+    digest = hasher.digest()
+    state.update(path=data_file_abs_path, df=df, offset=offset, digest=digest, hasher=hasher, version=version)
+    if not ends_with_newline:
+        return
+    if state["snapshot_rows"] is None or len(df) - state["snapshot_rows"] >= SNAPSHOT_INTERVAL_ROWS:
+        _save_snapshot(df, offset, digest)
+        state["snapshot_rows"] = len(df)
+
+
+def _load_snapshot():
+    """
+    Returns (rows, CSV offset, CSV digest) from the Parquet snapshot, or None if there is no
+    usable one. _read_journal still checks the digest against the CSV before trusting it.
+    """
+    if pyarrow is None:
+        return None
+    try:
+        table = pq.read_table(get_snapshot_file_path())
+        metadata = table.schema.metadata
+        offset = int(metadata[b"irontrack.offset"])
+        digest = bytes.fromhex(metadata[b"irontrack.digest"].decode())
+        return table.to_pandas(), offset, digest
+    except Exception:
+        return None  # Missing or unreadable snapshot; the CSV is parsed instead
+
+
+def _save_snapshot(df, offset, digest):
+    """Writes the parsed rows, tagged with the CSV offset and digest they cover, as Parquet."""
+    if pyarrow is None:
+        return
+    snapshot_path = get_snapshot_file_path()
+    try:
+        table = pyarrow.Table.from_pandas(df, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata.update({b"irontrack.offset": str(offset).encode(), b"irontrack.digest": digest.hex().encode()})
+        compression = "zstd" if pyarrow.Codec.is_available("zstd") else "snappy"
+        # Write then rename, so a crash mid-write never leaves a truncated snapshot behind
+        pq.write_table(table.replace_schema_metadata(metadata), snapshot_path + ".tmp", compression=compression)
+        os.replace(snapshot_path + ".tmp", snapshot_path)
+    except Exception:
+        pass  # The snapshot only speeds up cold starts; the CSV remains the source of truth
+
+
+def _append_workouts(df, tail):
+    """Concatenates newly parsed rows onto df, merging the categorical columns' categories."""
+    combined = pd.concat([df, tail], ignore_index=True)
+    for col in ("category", "exercise"):
+        # A plain concat of categoricals with different categories falls back to object dtype
+        combined[col] = union_categoricals([df[col], tail[col]])
+    return combined
+
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def _load_data_cached(data_file_abs_path, version):
+    """
+    Loads workout data from the CSV file.
+    Ensures column types are correct and handles missing file errors.
+    The version argument keys the cache and tells _read_journal which file state is expected.
+    """
+    try:
+        return _read_journal(data_file_abs_path, version)
     except FileNotFoundError:
         st.error(f"Error: Data file not found at {data_file_abs_path}. Please ensure it exists and is named correctly.")
-        return pd.DataFrame(columns=["date", "category", "exercise", "weight", "reps"])
+        return _empty_data()
     except Exception as e:
         st.error(f"An unexpected error occurred while loading data from {data_file_abs_path}: {e}")
-        return pd.DataFrame(columns=["date", "category", "exercise", "weight", "reps"])
+        return _empty_data()
+
+
+def get_data_version():
+    """
+    Returns the data file's (modification time in ns, size), used to key the data caches.
+    Any write changes it, so stale entries are never hit and nothing has to be cleared.
+    """
+    try:
+        stat = os.stat(get_data_file_path())
+        return stat.st_mtime_ns, stat.st_size
+    except OSError:
+        return None  # Missing file; let the cached loader report the error
+
+
+def load_data():
+    """Returns the workout data, re-parsing the CSV only when the file has changed on disk."""
+    return _load_data_cached(get_data_file_path(), get_data_version())
 
 
 def save_data(df):
     """Saves the DataFrame to the CSV file."""
     data_file_abs_path = get_data_file_path()
     try:
-        df.to_csv(data_file_abs_path, index=False)
-        # Invalidate the cache after saving so load_data will get fresh data on next call
-        load_data.clear()
+        df[DATA_COLUMNS].to_csv(data_file_abs_path, index=False)  # Derived columns aren't stored
     except Exception as e:
         st.error(f"An error occurred while saving data to {data_file_abs_path}: {e}")
 
 
+def _last_byte(path):
+    """Returns the final byte of a file, or b"" if the file is empty or missing."""
+    try:
+        with open(path, "rb") as f:
+            if f.seek(0, os.SEEK_END) == 0:
+                return b""
+            f.seek(-1, os.SEEK_END)
+            return f.read(1)
+    except FileNotFoundError:
+        return b""
+
+
+def _merge_logged_line(state, data_file_abs_path, line):
+    """
+    Merges a line log_set just appended into the in-memory rows. The row is already on disk,
+    so a failure here only marks the rows out of date and the next load re-reads the file.
+    """
+    try:
+        df = _append_workouts(state["df"], _parse_workouts(BytesIO(line), has_header=False))
+        hasher = state["hasher"].copy()
+        hasher.update(line)
+        offset = state["offset"] + len(line)
+        # As in _read_journal: if anything else appended since the write, the rows don't cover it
+        version = get_data_version()
+        synced = version if version is not None and version[1] == offset else None
+        _commit_journal(state, data_file_abs_path, df, offset, hasher, synced)
+    except Exception:
+        state["version"] = None
+
+
 def log_set(date, category, exercise, weight, reps):
-    """Adds a new workout set to the DataFrame and saves it."""
-    df = load_data()  # Load current data (might be cached)
-    new_row = pd.DataFrame([{
-        "date": date,
-        "category": category,
-        "exercise": exercise,
-        "weight": float(weight),
-        "reps": int(reps)
-    }])
-    df = pd.concat([df, new_row], ignore_index=True)
-    save_data(df)  # Save data, which will clear the cache
+    """
+    Appends a new workout set to the CSV file without rewriting the existing rows.
+    When the in-memory rows cover the whole file, the new row is merged into them as well,
+    so the next load neither re-reads nor re-hashes the file.
+    """
+    data_file_abs_path = get_data_file_path()
+    last_byte = _last_byte(data_file_abs_path)
+    buf = StringIO()
+    # Match the "\n" line endings pandas writes (csv defaults to "\r\n")
+    writer = csv.writer(buf, lineterminator="\n")
+    if not last_byte:  # Missing or empty file; the header is normally written at init
+        writer.writerow(DATA_COLUMNS)
+    elif last_byte != b"\n":  # A hand-edited file may lack its final newline
+        buf.write("\n")
+    writer.writerow([date, category, exercise, float(weight), int(reps)])
+    line = buf.getvalue().encode("utf-8")
+    state = _journal_state()
+    try:
+        with state["lock"]:
+            version = get_data_version()
+            in_sync = (state["path"] == data_file_abs_path and state["df"] is not None
+                       and state["version"] is not None and state["version"] == version
+                       and state["offset"] == version[1])
+            with open(data_file_abs_path, "ab") as f:
+                f.write(line)
+            if in_sync:
+                _merge_logged_line(state, data_file_abs_path, line)
+    except Exception as e:
+        st.error(f"An error occurred while saving data to {data_file_abs_path}: {e}")
+
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def _logged_data(version):
+    df = load_data()
+    return df[df["reps"] > 0]  # Rows with reps 0 only register an exercise, they aren't sets
+
+
+def get_logged_data():
+    """Returns only the actually logged sets, filtered once per data change."""
+    return _logged_data(get_data_version())
+
+
+@st.cache_resource(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def _logged_polars(version):
+    """
+    The logged sets converted to Polars, once per data change. Shared as a resource rather than
+    copied per rerun like cache_data results; Polars frames are immutable, so that is safe.
+    """
+    return pl.from_pandas(_logged_data(version))
+
+
+def get_progress_frame():
+    """
+    Returns the logged sets for the View Progress aggregations: a Polars LazyFrame when Polars
+    (and the pyarrow it converts through) is installed, otherwise the pandas frame.
+    """
+    version = get_data_version()
+    if pl is None or pyarrow is None:
+        return _logged_data(version)
+    return _logged_polars(version).lazy()
+
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def _row_index(version):
+    """Maps each exercise and each category to its row positions in load_data(), once per data change."""
+    df = load_data()
+    return df.groupby("exercise", observed=True).indices, df.groupby("category", observed=True).indices
+
+
+def get_exercise_rows(exercise):
+    """Returns all rows for an exercise via the cached row index instead of a full-frame scan."""
+    rows_by_exercise, _ = _row_index(get_data_version())
+    return load_data().take(rows_by_exercise.get(exercise, []))
+
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def _date_index(version):
+    """Maps each date to its row positions in load_data(), once per data change."""
+    df = load_data()
+    return {pd.Timestamp(d): rows for d, rows in df.groupby("date").indices.items()}
+
+
+def get_rows_for_date(day):
+    """Returns all rows logged on a date via the cached date index instead of a full-frame scan."""
+    rows_by_date = _date_index(get_data_version())
+    return load_data().take(rows_by_date.get(pd.Timestamp(day), []))
+
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def _unique_categories(version):
+    # The cached groupby index already holds the distinct categories in the data; np.union1d
+    # merges, dedupes and sorts them with the defaults without a Python-level set
+    _, rows_by_category = _row_index(version)
+    return np.union1d(np.fromiter(rows_by_category, dtype=object, count=len(rows_by_category)),
+                      np.fromiter(DEFAULT_CATEGORIES, dtype=object, count=len(DEFAULT_CATEGORIES))).tolist()
 
 
 def get_unique_categories():
     """Retrieves all unique categories from the data and default categories."""
+    return _unique_categories(get_data_version())
+
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def _exercise_index(version):
+    """Maps every category to its sorted exercises, defaults merged in, once per data change."""
     df = load_data()
-    all_categories = set(df["category"].dropna().unique()).union(DEFAULT_CATEGORIES.keys())
-    return sorted(list(all_categories))
+    # The distinct (category, exercise) pairs come out of one groupby instead of a mask per category
+    pairs = df.groupby(["category", "exercise"], observed=True).size().index
+    exercises = {cat: set(exs) for cat, exs in DEFAULT_CATEGORIES.items()}
+    for cat, ex in pairs:
+        exercises.setdefault(cat, set()).add(ex)
+    return {cat: sorted(exs) for cat, exs in exercises.items()}
 
 
 def get_exercises_for_category(category):
     """Retrieves all exercises for a given category from data and default categories."""
-    df = load_data()
-    custom_exercises = df[df["category"] == category]["exercise"].dropna().unique().tolist()
-    default_exercises = DEFAULT_CATEGORIES.get(category, [])
-    return sorted(list(set(default_exercises + custom_exercises)))
+    return _exercise_index(get_data_version()).get(category, [])
+
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def _unique_exercises(version):
+    rows_by_exercise, _ = _row_index(version)
+    return sorted(rows_by_exercise)
+
+
+def get_unique_exercises():
+    """Retrieves all exercises present in the data, sorted by name."""
+    return _unique_exercises(get_data_version())
 
 
 # --- Visualization-Specific Data Processing Functions ---
 
 # Helper function to prepare data for progress charts (Weight, Reps, Volume)
 def get_exercise_progress_data(df, selected_exercise):
-    df_filtered = df[(df["exercise"] == selected_exercise) & (df["reps"] > 0)].copy()
+    # Only the charted columns are taken along with the mask, so less is copied
+    df_filtered = df.loc[(df["exercise"] == selected_exercise) & (df["reps"] > 0), ["date", "reps", "weight", "volume"]]
     if df_filtered.empty:
         return pd.DataFrame()
-    df_filtered["date"] = pd.to_datetime(df_filtered["date"])
-    df_filtered['volume'] = df_filtered['weight'] * df_filtered['reps']
     # Group by date and sum for daily/workout totals
     daily_progress = df_filtered.groupby('date').agg({
         'reps': 'sum',
@@ -106,80 +476,160 @@ def get_exercise_progress_data(df, selected_exercise):
     return daily_progress.sort_values('date')
 
 
-def get_workout_consistency_data(df, period='Week'):
-    """Calculates workout consistency by counting unique days per period."""
-    df_logged = df[df['reps'] > 0].copy()  # Only consider actual logged workouts
-    if df_logged.empty:
-        return pd.DataFrame()
+def _is_lazy(df):
+    """Tells whether a visualization helper was handed the Polars frame from get_progress_frame."""
+    return pl is not None and isinstance(df, pl.LazyFrame)
+
 
-    df_logged['date'] = pd.to_datetime(df_logged['date'])
-    if period == 'Week':
-        df_logged['period'] = df_logged['date'].dt.to_period('W').astype(str)
-    elif period == 'Month':
-        df_logged['period'] = df_logged['date'].dt.to_period('M').astype(str)
-    else:  # Default to Week if unknown period
-        df_logged['period'] = df_logged['date'].dt.to_period('W').astype(str)
+def _collect(lf):
+    """Runs a Polars query and hands the result to the charts as pandas (empty result: empty frame)."""
+    result = lf.collect()
+    return result.to_pandas() if result.height else pd.DataFrame()
 
-    consistency_df = df_logged.groupby('period')['date'].nunique().reset_index(name='Workout Days')
-    return consistency_df.sort_values('period')
 
+def get_workout_consistency_data(df_logged, period='Week'):
+    """Calculates workout consistency by counting unique days per period. Expects logged sets only."""
+    if _is_lazy(df_logged):
+        # Like the pandas path: group on the bucket start, then label only the aggregated rows
+        start = pl.col('period')
+        if period == 'Month':
+            bucket, label = pl.col('date').dt.truncate('1mo'), start.dt.strftime('%Y-%m')
+        else:  # Week, also the default; same "Mon/Sun" labels as pandas' weekly periods
+            bucket = pl.col('date').dt.truncate('1w')
+            label = pl.concat_str([start.dt.strftime('%Y-%m-%d'), start.dt.offset_by('6d').dt.strftime('%Y-%m-%d')],
+                                  separator='/')
+        return _collect(df_logged.drop_nulls('date').group_by(bucket.alias('period'))
+                        .agg(pl.col('date').n_unique().cast(pl.Int64).alias('Workout Days'))
+                        .sort('period').with_columns(label))
 
-def get_category_distribution_data(df, metric='Total Volume'):
-    """Calculates distribution of workouts by category based on sets or volume."""
-    df_logged = df[df['reps'] > 0].copy()
     if df_logged.empty:
         return pd.DataFrame()
 
-    if metric == 'Number of Sets':
-        category_data = df_logged.groupby('category').size().reset_index(name='Count')
-        category_data = category_data.sort_values('Count', ascending=False)
-    elif metric == 'Total Volume':
-        df_logged['volume'] = df_logged['weight'] * df_logged['reps']
-        category_data = df_logged.groupby('category')['volume'].sum().reset_index(name='Total Volume')
-        category_data = category_data.sort_values('Total Volume', ascending=False)
-    else:
-        return pd.DataFrame()  # Should not happen with dropdown
+    # Bucket on datetime64 arithmetic instead of Period objects, and only build the label
+    # strings for the aggregated buckets. Grouping on the bucket start also sorts chronologically
+    days = df_logged['date'].to_numpy().astype('datetime64[D]')
+    if period == 'Month':
+        period_starts = days.astype('datetime64[M]')
+    else:  # Week, also the default if unknown period
+        # Day 0 of the epoch was a Thursday, so (day + 3) % 7 counts the days since Monday
+        period_starts = days - ((days.view('int64') + 3) % 7).astype('timedelta64[D]')
+    workout_days = df_logged['date'].groupby(period_starts.astype('datetime64[s]')).nunique()
+
+    starts = workout_days.index
+    if period == 'Month':
+        labels = starts.strftime('%Y-%m')
+    else:  # Same "Mon/Sun" labels as pandas' weekly periods
+        labels = starts.strftime('%Y-%m-%d') + '/' + (starts + pd.Timedelta(days=6)).strftime('%Y-%m-%d')
+    return pd.DataFrame({'period': labels, 'Workout Days': workout_days.to_numpy()})
+
+
+def _summarize_sets(df_logged, column, value_column):
+    """
+    Aggregates value_column ('Count' of sets or 'Total Volume') per value of column. Only the
+    requested metric is computed. On pandas this is a Series sorted largest first.
+    """
+    if _is_lazy(df_logged):
+        value = pl.len().cast(pl.Int64) if value_column == 'Count' else pl.col('volume').sum()
+        return df_logged.group_by(column).agg(value.alias(value_column))
+    if value_column == 'Count':
+        # value_counts counts and sorts in one call. As a categorical it also reports zeros for
+        # names that only appear on unlogged rows, which are dropped
+        totals = df_logged[column].value_counts()
+        return totals[totals.to_numpy() > 0]
+    return df_logged.groupby(column, sort=False, observed=True)['volume'].sum().sort_values(ascending=False)
+
+
+def get_category_distribution_data(df_logged, metric='Total Volume'):
+    """Calculates distribution of workouts by category based on sets or volume. Expects logged sets only."""
+    if metric not in METRIC_COLUMNS:  # Unknown metric should not happen with dropdown
+        return pd.DataFrame()
 
-    return category_data
+    value_column = METRIC_COLUMNS[metric]
+    if _is_lazy(df_logged):
+        return _collect(_summarize_sets(df_logged, 'category', value_column)
+                        .sort(value_column, descending=True, maintain_order=True))
+    if df_logged.empty:
+        return pd.DataFrame()
+    return _summarize_sets(df_logged, 'category', value_column).reset_index(name=value_column)
 
 
-def get_top_exercises_data(df, top_n=5, metric='Total Volume'):
-    """Calculates top N exercises based on total sets or total volume."""
-    df_logged = df[df['reps'] > 0].copy()
+def get_top_exercises_data(df_logged, top_n=5, metric='Total Volume'):
+    """Calculates top N exercises based on total sets or total volume. Expects logged sets only."""
+    if metric not in METRIC_COLUMNS:  # Unknown metric should not happen
+        return pd.DataFrame()
+
+    value_column = METRIC_COLUMNS[metric]
+    if _is_lazy(df_logged):
+        # top_k lets Polars keep only the N largest groups instead of sorting all of them
+        return _collect(_summarize_sets(df_logged, 'exercise', value_column)
+                        .top_k(top_n, by=value_column).sort(value_column, descending=True))
     if df_logged.empty:
         return pd.DataFrame()
+    # Cut to N before turning the index into a column, so only those rows are materialized
+    return _summarize_sets(df_logged, 'exercise', value_column).head(top_n).reset_index(name=value_column)
 
-    if metric == 'Number of Sets':
-        exercise_counts = df_logged.groupby('exercise').size().reset_index(name='Count')
-        top_exercises = exercise_counts.sort_values('Count', ascending=False).head(top_n)
-    elif metric == 'Total Volume':
-        df_logged['volume'] = df_logged['weight'] * df_logged['reps']
-        exercise_volumes = df_logged.groupby('exercise')['volume'].sum().reset_index(name='Total Volume')
-        top_exercises = exercise_volumes.sort_values('Total Volume', ascending=False).head(top_n)
+
+# --- Export Functions ---
+
+def _to_xlsx_bytes(df):
+    """Serializes a DataFrame to .xlsx bytes (values only, no styling)."""
+    df = df.assign(date=df["date"].dt.date)  # Write plain date cells rather than datetimes
+    excel_buffer = BytesIO()
+    if xlsxwriter is not None:
+        df.to_excel(excel_buffer, index=False, engine="xlsxwriter")
     else:
-        return pd.DataFrame()  # Should not happen
+        # openpyxl's write-only mode streams rows and skips the per-cell style bookkeeping
+        from openpyxl import Workbook
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet()
+        ws.append(list(df.columns))
+        for row in df.itertuples(index=False):
+            ws.append(list(row))
+        wb.save(excel_buffer)
+    return excel_buffer.getvalue()
+
 
-    return top_exercises
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def _csv_bytes(version, day=None):
+    """Encodes all logs (or only those for the given date) as CSV, once per data change."""
+    df = (load_data() if day is None else get_rows_for_date(day))[DATA_COLUMNS]
+    csv_buffer = BytesIO()  # Encode straight into bytes rather than building a str first
+    df.to_csv(csv_buffer, index=False, encoding="utf-8")
+    return csv_buffer.getvalue()
+
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def _xlsx_bytes(version, day=None):
+    """Encodes all logs (or only those for the given date) as .xlsx, once per data change."""
+    df = (load_data() if day is None else get_rows_for_date(day))[DATA_COLUMNS]
+    return _to_xlsx_bytes(df)
 
 
 # --- Initialize Data File if it doesn't exist ---
-DATA_FILE_ABS_PATH_INIT = get_data_file_path()
-
-if not os.path.exists(DATA_FILE_ABS_PATH_INIT):
-    st.warning(f"Data file '{DATA_FILE_ABS_PATH_INIT}' not found. Initializing with default categories.")
-    df_init = pd.DataFrame(columns=["date", "category", "exercise", "weight", "reps"])
-    rows = []
-    for cat, exs in DEFAULT_CATEGORIES.items():
-        for ex in exs:
-            rows.append({
-                "date": datetime.date.today().isoformat(),
-                "category": cat,
-                "exercise": ex,
-                "weight": 0.0,
-                "reps": 0
-            })
-    df_init = pd.concat([df_init, pd.DataFrame(rows)], ignore_index=True)
-    df_init.to_csv(DATA_FILE_ABS_PATH_INIT, index=False)
+
+@st.cache_resource(show_spinner=False)
+def _ensure_data_file():
+    """
+    Seeds the data file with the default categories if it doesn't exist.
+    Cached as a resource so the check runs once per process instead of on every rerun.
+    Returns a process-wide dict whose "created" flag is set if the file had to be created;
+    the first run to pop it reports that.
+    """
+    data_file_abs_path = get_data_file_path()
+    if os.path.exists(data_file_abs_path):
+        return {}
+    today_iso = datetime.date.today().isoformat()
+    rows = [(today_iso, cat, ex, 0.0, 0) for cat, exs in DEFAULT_CATEGORIES.items() for ex in exs]
+    # Build the frame straight from the rows; no empty frame to concat onto
+    df_init = pd.DataFrame(rows, columns=DATA_COLUMNS)
+    df_init.to_csv(data_file_abs_path, index=False)
+    return {"created": True}
+
+
+# The warning lives outside the cached function, which would otherwise replay it on every rerun.
+# Popping the flag shows it once for the run that seeded the file, not once for every later session
+if _ensure_data_file().pop("created", False):
+    st.warning(f"Data file '{get_data_file_path()}' not found. Initializing with default categories.")
 
 # --- Streamlit UI Layout ---
 st.set_page_config(page_title="IronTracker", layout="wide")
@@ -190,19 +640,18 @@ menu = st.sidebar.radio("Navigate", ["Log Workout", "View Workouts", "Add Custom
 
 # Export All Logs Section in Sidebar
 st.sidebar.markdown("---")
-st.sidebar.markdown("### 📤 Export All Logs")
-df_export = load_data()
-csv_data = df_export.to_csv(index=False).encode("utf-8")
-st.sidebar.download_button("Download CSV", csv_data, "workout_log.csv", mime="text/csv")
-excel_buffer = BytesIO()
-df_export.to_excel(excel_buffer, index=False, engine="openpyxl")
-st.sidebar.download_button("Download Excel", excel_buffer.getvalue(), "workout_log.xlsx",
-                           mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+data_version = get_data_version()
+with st.sidebar.expander("📤 Export All Logs"):
+    # Pass callables so the files are only built when a button is clicked, not on every rerun
+    st.download_button("Download CSV", partial(_csv_bytes, data_version), "workout_log.csv", mime="text/csv")
+    st.download_button("Download Excel", partial(_xlsx_bytes, data_version), "workout_log.xlsx",
+                       mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
 
 # Date Navigation for Log Workout (shared)
 today = datetime.date.today()
-if "log_date" not in st.session_state:
-    st.session_state["log_date"] = today
+# "log_date" is the Select Date widget's own key. Re-assigning it keeps Streamlit from
+# dropping the value while another page (where the widget isn't rendered) is shown.
+st.session_state["log_date"] = st.session_state.get("log_date", today)
 
 col1, col2, col3, col4 = st.columns([1, 4, 1, 1])
 with col1:
@@ -218,7 +667,7 @@ with col4:
 # --- Log Workout Section ---
 if menu == "Log Workout":
     st.subheader("📆 Log Workout")
-    log_date = st.date_input("Select Date", st.session_state["log_date"], key="date_picker")
+    log_date = st.date_input("Select Date", key="log_date")
     category = st.selectbox("Select Category", ["Select"] + get_unique_categories(), index=0, key="log_category_select")
 
     if category != "Select":
@@ -239,63 +688,59 @@ if menu == "Log Workout":
                     st.success(f"✅ Saved: {reps} reps @ {weight}kg for {exercise} on {log_date}")
 
             with tab2:
-                df = load_data()
-                hist = df[(df["exercise"] == exercise) & (df["reps"] > 0)]
-                hist = hist.sort_values("date", ascending=False)
+                df = get_exercise_rows(exercise)
+                hist = df[df["reps"] > 0]
+                hist = hist.sort_values("date", ascending=False, kind="stable")
                 if hist.empty:
                     st.info("No past workouts found for this exercise.")
                 else:
                     st.markdown("#### Past Sets for This Exercise")
-                    for d in hist["date"].unique():
-                        st.markdown(f"**{d}**")
-                        sets_on_date = hist[hist["date"] == d]
-                        for _, row in sets_on_date.iterrows():
-                            st.write(f"{int(row['reps'])} reps @ {row['weight']}kg")
+                    # Build every line in one vectorized pass and emit one element per date rather than
+                    # one st.write per set. hist is sorted newest first; sort=False keeps that order
+                    lines = hist["reps"].astype(str) + " reps @ " + hist["weight"].astype(str) + "kg"
+                    for d, sets_on_date in lines.groupby(hist["date"], sort=False):
+                        st.markdown(f"**{d.date()}**  \n" + "  \n".join(sets_on_date))
 
             with tab3:
                 # Basic progress graphs (weight and reps) for the selected exercise
-                df_plot = load_data()
-                df_plot_filtered = df_plot[(df_plot["exercise"] == exercise) & (df_plot["reps"] > 0)].copy()
+                df_plot = get_exercise_rows(exercise)
+                df_plot_filtered = df_plot[df_plot["reps"] > 0]
 
                 if df_plot_filtered.empty:
                     st.info("No data to plot for this exercise.")
                 else:
-                    df_plot_filtered["date"] = pd.to_datetime(df_plot_filtered["date"])
-                    st.markdown("##### Reps Over Time")
-                    st.line_chart(df_plot_filtered.set_index("date")["reps"], use_container_width=True)
-                    st.markdown("##### Weight Over Time")
-                    st.line_chart(df_plot_filtered.set_index("date")["weight"], use_container_width=True)
+                    # One multi-series chart instead of separate reps and weight charts
+                    st.markdown("##### Reps & Weight Over Time")
+                    st.line_chart(df_plot_filtered.set_index("date")[["reps", "weight"]], use_container_width=True)
 
 
 # --- View Workouts Section ---
 elif menu == "View Workouts":
     st.subheader("📅 View Workouts By Date")
     selected_date = st.date_input("Pick a Date to View", today, key="view_date_picker")
-    df = load_data()
-
-    df_day = df[df["date"] == str(selected_date)]
+    df_day = get_rows_for_date(selected_date)
 
     if df_day.empty:
         st.info("No workouts found for this date. Try navigating to an earlier date like 2025-05-01.")
     else:
         st.markdown("### 🔽 Download This Day's Workouts")
-        csv_day = df_day.to_csv(index=False).encode("utf-8")
-        st.download_button("Download CSV", csv_day, f"workouts_{selected_date}.csv", mime="text/csv")
-        excel_day_buffer = BytesIO()
-        df_day.to_excel(excel_day_buffer, index=False, engine="openpyxl")
-        st.download_button("Download Excel", excel_day_buffer.getvalue(), f"workouts_{selected_date}.xlsx",
+        st.download_button("Download CSV", partial(_csv_bytes, data_version, selected_date),
+                           f"workouts_{selected_date}.csv", mime="text/csv")
+        st.download_button("Download Excel", partial(_xlsx_bytes, data_version, selected_date),
+                           f"workouts_{selected_date}.xlsx",
                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
 
-        for cat in df_day["category"].unique():
-            st.markdown(f"### {selected_date} - {cat}")
-            for ex in df_day[df_day["category"] == cat]["exercise"].unique():
-                st.markdown(f"**{ex}**")
-                sets_for_display = df_day[(df_day["category"] == cat) & (df_day["exercise"] == ex)]
-                for _, row in sets_for_display.iterrows():
-                    display_reps = f"{int(row['reps'])} reps" if row['reps'] > 0 else "N/A reps"
-                    display_weight = f"{row['weight']}kg" if row['weight'] > 0 else "N/A weight"
+        # Format all set lines at once; unlogged reps/weight show as N/A
+        display_reps = (df_day["reps"].astype(str) + " reps").where(df_day["reps"] > 0, "N/A reps")
+        display_weight = (df_day["weight"].astype(str) + "kg").where(df_day["weight"] > 0, "N/A weight")
+        df_day = df_day.assign(display=display_reps + " @ " + display_weight)
 
-                    st.write(f"{display_reps} @ {display_weight}")
+        # Group once per level instead of re-masking df_day for every category/exercise pair,
+        # and render each exercise's sets as a single markdown element
+        for cat, df_cat in df_day.groupby("category", sort=False, observed=True):
+            st.markdown(f"### {selected_date} - {cat}")
+            for ex, sets_for_display in df_cat.groupby("exercise", sort=False, observed=True)["display"]:
+                st.markdown(f"**{ex}**  \n" + "  \n".join(sets_for_display))
 
 # --- Add Custom Exercise Section ---
 elif menu == "Add Custom Exercise":
@@ -315,9 +760,10 @@ elif menu == "Add Custom Exercise":
 # --- View Progress Section (Enhanced with multiple visualizations) ---
 elif menu == "View Progress":
     st.subheader("📈 Analyze Your Progress")
-    df_all_data = load_data()  # Load data once for this section
+    df_logged = get_logged_data()  # Load the logged sets once for this section
+    progress_frame = get_progress_frame()  # Same rows, as Polars when available, for the aggregations
 
-    if df_all_data.empty or df_all_data[df_all_data['reps'] > 0].empty:
+    if df_logged.empty:
         st.info("No actual workout data available to analyze progress. Log some workouts first!")
     else:
         visualization_type = st.selectbox(
@@ -334,18 +780,16 @@ elif menu == "View Progress":
 
         if visualization_type == "Weight, Reps & Volume Progress for an Exercise":
             st.markdown("#### Weight, Reps & Volume Over Time for an Exercise")
-            all_exercises = sorted(df_all_data["exercise"].dropna().unique())
+            all_exercises = get_unique_exercises()
             selected_exercise = st.selectbox("Select Exercise", all_exercises, key="viz_exercise_select")
 
             if selected_exercise:
-                progress_data = get_exercise_progress_data(df_all_data, selected_exercise)
+                progress_data = get_exercise_progress_data(get_exercise_rows(selected_exercise), selected_exercise)
                 if progress_data.empty:
                     st.info(f"No actual logged data to show progress for '{selected_exercise}'.")
                 else:
-                    st.markdown("##### Reps Over Time")
-                    st.line_chart(progress_data.set_index("date")["reps"], use_container_width=True)
-                    st.markdown("##### Weight Over Time")
-                    st.line_chart(progress_data.set_index("date")["weight"], use_container_width=True)
+                    st.markdown("##### Reps & Weight Over Time")
+                    st.line_chart(progress_data.set_index("date")[["reps", "weight"]], use_container_width=True)
                     st.markdown("##### Total Volume Over Time (Weight x Reps)")
                     st.line_chart(progress_data.set_index("date")["volume"], use_container_width=True)
 
@@ -353,7 +797,7 @@ elif menu == "View Progress":
             st.markdown("#### Workout Consistency Over Time")
             period_choice = st.radio("Group by:", ["Week", "Month"], key="consistency_period_radio")
 
-            consistency_df = get_workout_consistency_data(df_all_data, period_choice)
+            consistency_df = get_workout_consistency_data(progress_frame, period_choice)
             if consistency_df.empty:
                 st.info("No data available to track workout consistency.")
             else:
@@ -364,7 +808,7 @@ elif menu == "View Progress":
             st.markdown("#### Distribution of Workouts by Category")
             metric_choice = st.radio("Measure by:", ["Number of Sets", "Total Volume"], key="category_metric_radio")
 
-            category_data = get_category_distribution_data(df_all_data, metric_choice)
+            category_data = get_category_distribution_data(progress_frame, metric_choice)
             if category_data.empty:
                 st.info("No data available to show category distribution.")
             else:
@@ -380,7 +824,7 @@ elif menu == "View Progress":
             metric_choice_top = st.radio("Measure by:", ["Number of Sets", "Total Volume"],
                                          key="top_exercises_metric_radio")
 
-            top_exercises = get_top_exercises_data(df_all_data, top_n, metric_choice_top)
+            top_exercises = get_top_exercises_data(progress_frame, top_n, metric_choice_top)
             if top_exercises.empty:
                 st.info("No data available to determine top exercises.")
             else: